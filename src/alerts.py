@@ -0,0 +1,178 @@
+import requests
+import pandas as pd
+import operator
+import json
+import os
+from datetime import datetime
+
+from custom_dirs import DataDirectory, RootDirectory
+
+RULES_FILE = os.path.join(RootDirectory.path, "src", "alert_rules.json")
+STATE_FILE = os.path.join(DataDirectory.path, "alert_state.json")
+
+# How rows of each data source are identified: `key` is the row's date column,
+# `group_by` splits the source into independent series (e.g. FII vs DII).
+SOURCES = {
+    'fii_dii': {'key': 'date', 'group_by': 'category'},
+    'usd_inr': {'key': 'time_last_update_utc', 'group_by': 'Currency'},
+    'gold': {'key': 'date', 'group_by': None},
+    'nifty50': {'key': 'date', 'group_by': 'symbol'},
+}
+
+OPERATORS = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '==': operator.eq,
+    'abs>': lambda a, b: abs(a) > b,
+    'abs>=': lambda a, b: abs(a) >= b,
+}
+
+
+def file_sink(alert, path=os.path.join(DataDirectory.path, "alerts.log")):
+    """Appends the alert as a JSON line to a local file."""
+    with open(path, 'a') as f:
+        f.write(json.dumps(alert) + "\n")
+
+
+def webhook_sink(alert, url=None):
+    """Posts the alert as JSON to a webhook endpoint (ALERT_WEBHOOK_URL by default)."""
+    if url is None:
+        url = os.getenv("ALERT_WEBHOOK_URL", "http://localhost:8000/alerts")
+    try:
+        requests.post(url, json=alert, timeout=5).raise_for_status()
+    except requests.exceptions.RequestException as e:
+        print(f"Webhook sink failed: {e}")
+
+
+def print_sink(alert):
+    """Prints the alert to stdout."""
+    print(f"ALERT: {alert['message']}")
+
+
+SINKS = {
+    'file': file_sink,
+    'webhook': webhook_sink,
+    'print': print_sink,
+}
+
+
+def register_sink(name, func):
+    """Registers a custom notification sink callable taking the alert dict."""
+    SINKS[name] = func
+
+
+def load_rules(filename=RULES_FILE):
+    """Loads the alert rules and sink configuration."""
+    if not os.path.exists(filename):
+        return {'rules': [], 'sinks': []}
+    with open(filename) as f:
+        return json.load(f)
+
+
+def load_state(filename=STATE_FILE):
+    if os.path.exists(filename):
+        with open(filename) as f:
+            return json.load(f)
+    return {}
+
+
+def save_state(state, filename=STATE_FILE):
+    with open(filename, 'w') as f:
+        json.dump(state, f, indent=4)
+
+
+def _metric(rule, value, series_state, row_key):
+    """Computes the rule's metric for a new value from the rolling per-series state."""
+    metric = rule.get('metric', 'value')
+    if metric == 'value':
+        return value
+    # A re-ingested row for the same date compares against the value before it
+    if series_state.get('last_key') == row_key:
+        baseline = series_state.get('prev_value')
+    else:
+        baseline = series_state.get('last_value')
+    if baseline is None:
+        return None
+    if metric == 'change':
+        return value - baseline
+    if metric == 'pct_change':
+        return (value - baseline) / baseline * 100 if baseline else None
+    raise ValueError(f"Unknown metric: {metric}")
+
+
+def _update_series_state(series_state, value, row_key):
+    if series_state.get('last_key') != row_key:
+        series_state['prev_value'] = series_state.get('last_value')
+        series_state['last_key'] = row_key
+    series_state['last_value'] = value
+
+
+def evaluate_alerts(source, new_rows, config=None, state=None):
+    """Evaluates the configured rules for `source` against newly ingested rows only.
+
+    Each rule keeps the last seen value per series in the state file, so the
+    cost depends on the number of new rows, not on the length of the history.
+    Returns the list of alerts that fired.
+    """
+    if new_rows is None or len(new_rows) == 0:
+        return []
+    try:
+        config = config if config is not None else load_rules()
+        rules = [r for r in config.get('rules', []) if r.get('source') == source]
+        if not rules:
+            return []
+        persist = state is None
+        state = state if state is not None else load_state()
+
+        df = pd.DataFrame(new_rows)
+        spec = SOURCES[source]
+        fired = []
+        for rule in rules:
+            rows = df
+            for column, expected in rule.get('filter', {}).items():
+                rows = rows[rows[column] == expected]
+            values = pd.to_numeric(rows[rule['field']], errors='coerce')
+            compare = OPERATORS[rule['op']]
+
+            for (_, row), value in zip(rows.iterrows(), values):
+                if pd.isna(value):
+                    continue
+                group = str(row[spec['group_by']]) if spec['group_by'] else ''
+                row_key = str(row[spec['key']])
+                series_state = state.setdefault(f"{rule['name']}|{group}", {})
+
+                metric_value = _metric(rule, float(value), series_state, row_key)
+                _update_series_state(series_state, float(value), row_key)
+                if metric_value is None or not compare(metric_value, rule['threshold']):
+                    continue
+                # Fire once per series per date even if the row is ingested again
+                if series_state.get('fired_key') == row_key:
+                    continue
+                series_state['fired_key'] = row_key
+
+                alert = {
+                    'rule': rule['name'],
+                    'source': source,
+                    'series': group,
+                    'date': row_key,
+                    'value': round(metric_value, 4),
+                    'threshold': rule['threshold'],
+                    'message': f"{rule['name']}: {group + ' ' if group else ''}{rule['field']} "
+                               f"{rule.get('metric', 'value')} {metric_value:.2f} {rule['op']} {rule['threshold']} on {row_key}",
+                    'triggered_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                }
+                fired.append(alert)
+
+        for alert in fired:
+            for sink in config.get('sinks', []):
+                sink = dict(sink)
+                SINKS[sink.pop('type')](alert, **sink)
+
+        if persist:
+            save_state(state)
+        return fired
+    except Exception as e:
+        print(f"Error evaluating alerts for {source}: {e}")
+        return []
@@ -3,6 +3,8 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import os
 from custom_dirs import DataDirectory, RootDirectory
+from alerts import evaluate_alerts
+from windowed_reader import read_csv_window, upsert_csv
 from matplotlib.dates import DayLocator, DateFormatter
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
@@ -37,27 +39,31 @@ def create_dataframe(data):
     df['time_last_update_utc'] = pd.to_datetime(df['time_last_update_utc']).dt.strftime('%d/%m/%Y')
     df = df[df['Currency'] == 'INR']
     print(df)
-    # apend this to dataframe existing at  to ./data/ folder usd_to_inr_exchange_rate.csv
-    if os.path.exists(os.path.join(DataDirectory.path,"usd_to_inr_exchange_rate.csv")):
-        existing_df = pd.read_csv(os.path.join(DataDirectory.path,"usd_to_inr_exchange_rate.csv"))
-        df = pd.concat([existing_df, df], ignore_index=True)
-    # remove duplicate
-    df = df.drop_duplicates(subset='time_last_update_utc')
-    df.to_csv(os.path.join(DataDirectory.path,"usd_to_inr_exchange_rate.csv"), index=False)
+    # append this to ./data/usd_to_inr_exchange_rate.csv unless the date is already there
+    upsert_csv(os.path.join(DataDirectory.path,"usd_to_inr_exchange_rate.csv"), df, ['time_last_update_utc'], keep='first')
+    evaluate_alerts('usd_inr', df)
     return df
 
 
+def load_exchange_rate_data(filename=os.path.join(DataDirectory.path,"usd_to_inr_exchange_rate.csv"), days=30):
+    """Loads the last `days` days of exchange rates without reading the full history."""
+    if not os.path.exists(filename):
+        print(f"File {filename} does not exist.")
+        return None
+    return read_csv_window(filename, 'time_last_update_utc', start=datetime.today() - timedelta(days=days))
+
+
 def plot_and_save_usd_to_inr(df, filename=os.path.join(RootDirectory.path,"src","usd_to_inr_exchange_rate.png")):
-    """Plots and saves the USD to INR exchange rate."""
+    """Plots and saves the USD to INR exchange rate. Returns True if the image was saved."""
     if df is None:
         print("No data to plot.")
-        return
+        return False
 
     try:
         df_inr = df[df['Currency'] == 'INR'].copy()
         if df_inr.empty:
             print("No INR data found in DataFrame.")
-            return
+            return False
             
         # Convert time_last_update_utc to datetime and set as index
         df_inr['time_last_update_utc'] = pd.to_datetime(df_inr['time_last_update_utc'], format='mixed', dayfirst=True)
@@ -106,15 +112,17 @@ def plot_and_save_usd_to_inr(df, filename=os.path.join(RootDirectory.path,"src",
 
         # Clear the plot
         plt.close()
+        return True
 
     except Exception as e:
         print(f"An error occurred during plotting: {e}")
+        return False
 
 def main():
     """Main function to orchestrate the process."""
     data = get_exchange_rate_data(url)
-    df = create_dataframe(data)
-    plot_and_save_usd_to_inr(df)
+    create_dataframe(data)
+    plot_and_save_usd_to_inr(load_exchange_rate_data())
 if __name__ == "__main__":
     main()
 
@@ -6,6 +6,8 @@ from datetime import datetime, timedelta
 from matplotlib.dates import DayLocator, DateFormatter
 
 from custom_dirs import DataDirectory, RootDirectory
+from alerts import evaluate_alerts
+from windowed_reader import read_csv_window, upsert_csv
 
 
 def get_fii_dii_data():
@@ -54,24 +56,27 @@ def get_fii_dii_data():
 
 
 def save_data_to_csv(data, filename=os.path.join(DataDirectory.path, "fii_dii_buy_sell_data.csv")):
+    """Merges the API rows into the CSV. Returns True if the data was saved."""
     if data:
         try:
             df = pd.DataFrame(data)
             print(df)
-            # df.to_csv(filename, index=False)
-            if os.path.exists(filename):
-                existing_df = pd.read_csv(filename)
-                df = pd.concat([existing_df, df], ignore_index=True)
-            df.drop_duplicates(subset=['date', 'category'], keep='last', inplace=True)
-            df.to_csv(filename, index=False)
+            # Merge into the history file without loading it all into memory
+            upsert_csv(filename, df, ['date', 'category'], keep='last')
             print(f"Data saved to {filename}")
+            evaluate_alerts('fii_dii', df)
+            return True
         except IOError as e:
             print(f"Error saving data to {filename}: {e}")
+    return False
 
 
-def load_data_from_csv(filename=os.path.join(DataDirectory.path,"fii_dii_buy_sell_data.csv")):
+def load_data_from_csv(filename=os.path.join(DataDirectory.path,"fii_dii_buy_sell_data.csv"), start_date=None):
     try:
         if os.path.exists(filename):
+            if start_date is not None:
+                # Stream only the requested window instead of the whole history
+                return read_csv_window(filename, 'date', start=start_date)
             df = pd.read_csv(filename)
             return df
         else:
@@ -89,6 +94,7 @@ def load_data_from_csv(filename=os.path.join(DataDirectory.path,"fii_dii_buy_sel
 
 
 def create_visualization(df, filename=os.path.join(RootDirectory.path, "src","fii_dii_trends.png")):
+    """Plots the FII/DII trends. Returns True if the image was saved."""
     if df is not None:
         try:
             # Convert 'date' column to datetime objects
@@ -149,8 +155,10 @@ def create_visualization(df, filename=os.path.join(RootDirectory.path, "src","fi
 
             # Close the plot to prevent display
             plt.close()
+            return True
         except Exception as e:
             print(f"An error occurred: {e}")
+    return False
 
 
 def main():
@@ -160,7 +168,7 @@ def main():
     else:
         print("No new data received from API, using existing data for visualization")
     
-    df = load_data_from_csv()
+    df = load_data_from_csv(start_date=datetime.today() - timedelta(days=30))
     if df is not None and not df.empty:
         create_visualization(df)
     else:
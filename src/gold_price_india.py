@@ -11,6 +11,8 @@ from serpapi import GoogleSearch
 from matplotlib.dates import DayLocator, DateFormatter
 
 from custom_dirs import DataDirectory, ReportDirectory, RootDirectory
+from alerts import evaluate_alerts
+from windowed_reader import read_csv_window, upsert_csv
 
 # Load environment variables from .env file
 load_dotenv(os.path.join(os.path.dirname(__file__), '.env'))
@@ -58,8 +60,11 @@ def get_gold_price_with_serpapi():
         print(f"Error fetching data from SerpAPI: {e}")
         return None
 
-def get_gold_price_data():
-    """Gets today's gold price data using Azure OpenAI with SerpAPI context."""
+def get_gold_price_data(use_fallback=True):
+    """Gets today's gold price data using Azure OpenAI with SerpAPI context.
+
+    On failure returns fallback_data(), or None when use_fallback is False.
+    """
     try:
         # Initialize the Azure OpenAI client
         client = AzureOpenAI(
@@ -108,7 +113,7 @@ def get_gold_price_data():
         # Validate that the response contains the required fields
         if not all(key in json_response for key in ['gold_24k_price', 'gold_22k_price']):
             print("Incomplete data received from API")
-            return fallback_data()
+            return fallback_data() if use_fallback else None
             
         # Get current date
         current_date = datetime.now().strftime('%d/%m/%Y')
@@ -127,7 +132,7 @@ def get_gold_price_data():
     
     except Exception as e:
         print(f"Error fetching gold price data: {e}")
-        return fallback_data()
+        return fallback_data() if use_fallback else None
 
 def fallback_data():
     """Returns fallback data if API call fails."""
@@ -141,10 +146,10 @@ def fallback_data():
     }
 
 def save_gold_data_to_csv(data, filename=os.path.join(DataDirectory.path,"gold_price_data.csv")):
-    """Saves gold price data to CSV file."""
+    """Saves gold price data to CSV file. Returns True if the data was saved."""
     if not data:
         print("No data to save.")
-        return
+        return False
     
     # Create data directory if it doesn't exist
     os.makedirs(os.path.dirname(filename), exist_ok=True)
@@ -153,41 +158,30 @@ def save_gold_data_to_csv(data, filename=os.path.join(DataDirectory.path,"gold_p
     df = pd.DataFrame([data])
     print(df)
     try:
-        # If file exists, append to it
-        if os.path.exists(filename):
-            existing_df = pd.read_csv(filename)
-            df = pd.concat([existing_df, df], ignore_index=True)
-            
-        # Remove duplicates based on date
-        df.drop_duplicates(subset=['date'], keep='last', inplace=True)
-        
-        # Save to CSV
-        df.to_csv(filename, index=False)
+        # Append to the file, replacing any existing row for the same date
+        upsert_csv(filename, df, ['date'], keep='last')
         print(f"Gold price data saved to {filename}")
+        evaluate_alerts('gold', df)
+        return True
         
     except Exception as e:
         print(f"Error saving gold price data: {e}")
+        return False
 
 def plot_gold_price_trend(filename=os.path.join(DataDirectory.path,"gold_price_data.csv"), output_file=os.path.join(RootDirectory.path, "src","gold_price_trend.png")):
-    """Creates a visualization of gold price trends."""
+    """Creates a visualization of gold price trends. Returns True if the image was saved."""
     try:
         if not os.path.exists(filename):
             print(f"File {filename} does not exist.")
-            return
-        
-        # Read data
-        df = pd.read_csv(filename)
+            return False
         
-        # Convert date to datetime
-        df['date'] = pd.to_datetime(df['date'], format='mixed', dayfirst=True)
+        # Read only the last 30 days, with dates parsed
+        start_date = datetime.today() - timedelta(days=30)
+        df = read_csv_window(filename, 'date', start=start_date)
         
         # Sort by date
         df = df.sort_values('date')
         
-        # Filter last 30 days
-        start_date = datetime.today() - timedelta(days=30)
-        df = df[df['date'] >= start_date]
-        
         # Create date strings for display
         df['date_str'] = df['date'].dt.strftime('%d/%m/%Y')
         
@@ -230,9 +224,11 @@ def plot_gold_price_trend(filename=os.path.join(DataDirectory.path,"gold_price_d
         
         # Close plot
         plt.close()
+        return True
         
     except Exception as e:
         print(f"Error creating gold price visualization: {e}")
+        return False
 
 def main():
     """Main function to orchestrate the process."""
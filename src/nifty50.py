@@ -5,6 +5,9 @@ import json
 import os
 import time
 from custom_dirs import DataDirectory
+from nifty50_analytics import compute_nifty50_analytics
+from alerts import evaluate_alerts
+from nse_bhavcopy import ingest_bhavcopy, bhavcopy_to_stock_data, save_ohlcv_to_csv, OHLCV_COLUMNS
 
 def get_nifty50_symbols():
     # Nifty 50 symbols
@@ -86,6 +89,7 @@ def fetch_stock_data():
                     stock_hist = hist[symbol]
                     if not stock_hist.empty:
                         stock_data.append({
+                            'date': stock_hist.index[-1].strftime('%d/%m/%Y'),
                             'symbol': symbol.replace('.NS', ''),
                             'open': round(stock_hist['Open'].iloc[-1], 2),
                             'close': round(stock_hist['Close'].iloc[-1], 2),
@@ -107,6 +111,14 @@ def fetch_stock_data():
     print(f"Successfully fetched data for {len(stock_data)} out of {len(symbols)} stocks")
     return stock_data
 
+def fetch_stock_data_from_bhavcopy():
+    """Fetches today's OHLCV for all symbols from the NSE bhavcopy in a single download."""
+    df = ingest_bhavcopy(symbols=get_nifty50_symbols())
+    if df is None or df.empty:
+        return []
+    print(f"Successfully fetched bhavcopy data for {len(df)} stocks")
+    return bhavcopy_to_stock_data(df)
+
 def fetch_nifty50_index():
     try:
         print("Fetching Nifty 50 index data...")
@@ -130,9 +142,17 @@ def fetch_nifty50_index():
 
 def process_and_save_data():
     print("Starting data fetch process...")
-    stock_data = fetch_stock_data()
+    stock_data = fetch_stock_data_from_bhavcopy()
+    if not stock_data:
+        print("Bhavcopy not available, falling back to yfinance")
+        stock_data = fetch_stock_data()
+        # Keep the OHLCV store complete; a later bhavcopy backfill replaces these rows
+        save_ohlcv_to_csv(pd.DataFrame(stock_data, columns=OHLCV_COLUMNS))
     nifty_index = fetch_nifty50_index()
     
+    # Compute breadth, movers and sector aggregates once here instead of in the browser
+    stock_data, analytics = compute_nifty50_analytics(stock_data)
+    
     # Create output directory if it doesn't exist
     output_dir = DataDirectory.path
     if not os.path.exists(output_dir):
@@ -143,6 +163,7 @@ def process_and_save_data():
     output_data = {
         'nifty50_index': nifty_index,
         'stocks': stock_data,
+        'analytics': analytics,
         'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     }
     
@@ -150,6 +171,10 @@ def process_and_save_data():
     with open(output_file, 'w') as f:
         json.dump(output_data, f, indent=4)
     print(f"Data saved to {output_file}")
+    
+    # Evaluate alert rules against the snapshot, keyed by its trade date
+    evaluate_alerts('nifty50', stock_data)
+    return output_data
 
 if __name__ == "__main__":
     process_and_save_data() 
\ No newline at end of file
@@ -0,0 +1,128 @@
+import pandas as pd
+import numpy as np
+
+# Sector classification for the Nifty 50 universe (symbols without the .NS suffix)
+SECTOR_MAP = {
+    'RELIANCE': 'Oil & Gas',
+    'TCS': 'IT',
+    'HDFCBANK': 'Financials',
+    'INFY': 'IT',
+    'ICICIBANK': 'Financials',
+    'HINDUNILVR': 'FMCG',
+    'SBIN': 'Financials',
+    'BHARTIARTL': 'Telecom',
+    'ITC': 'FMCG',
+    'KOTAKBANK': 'Financials',
+    'HCLTECH': 'IT',
+    'WIPRO': 'IT',
+    'AXISBANK': 'Financials',
+    'ASIANPAINT': 'Consumer Durables',
+    'ULTRACEMCO': 'Cement',
+    'TITAN': 'Consumer Durables',
+    'BAJFINANCE': 'Financials',
+    'MARUTI': 'Auto',
+    'NESTLEIND': 'FMCG',
+    'BAJAJFINSV': 'Financials',
+    'BAJAJ-AUTO': 'Auto',
+    'HINDALCO': 'Metals',
+    'JSWSTEEL': 'Metals',
+    'POWERGRID': 'Power',
+    'ADANIENT': 'Diversified',
+    'ADANIPORTS': 'Services',
+    'ADANIPOWER': 'Power',
+    'BPCL': 'Oil & Gas',
+    'BRITANNIA': 'FMCG',
+    'CIPLA': 'Pharma',
+    'COALINDIA': 'Metals',
+    'DLF': 'Realty',
+    'DIVISLAB': 'Pharma',
+    'DRREDDY': 'Pharma',
+    'EICHERMOT': 'Auto',
+    'GAIL': 'Oil & Gas',
+    'GODREJCP': 'FMCG',
+    'GRASIM': 'Cement',
+    'HDFCLIFE': 'Financials',
+    'HEROMOTOCO': 'Auto',
+    'ICICIGI': 'Financials',
+    'ICICIPRULI': 'Financials',
+    'IOC': 'Oil & Gas',
+    'INDUSINDBK': 'Financials',
+    'M&M': 'Auto',
+    'MARICO': 'FMCG',
+    'NTPC': 'Power',
+    'ONGC': 'Oil & Gas',
+    'PIDILITIND': 'Chemicals',
+    'SBILIFE': 'Financials',
+    'SHREECEM': 'Cement',
+    'SUNPHARMA': 'Pharma',
+    'TATASTEEL': 'Metals',
+    'TECHM': 'IT',
+    'UPL': 'Chemicals',
+}
+
+
+def _records(df):
+    """Converts a DataFrame to JSON-safe records (NaN becomes None)."""
+    return df.astype(object).where(df.notna(), None).to_dict(orient='records')
+
+
+def compute_nifty50_analytics(stock_data, top_n=5):
+    """Computes index-level metrics over the per-stock snapshot.
+
+    Returns a tuple of (stocks, analytics): the stock rows enriched with
+    change / change_pct / sector and sorted by % change, and a dict with
+    breadth, top movers, volume leaders and sector aggregates.
+    """
+    if not stock_data:
+        return [], None
+
+    df = pd.DataFrame(stock_data)
+    df['sector'] = df['symbol'].map(SECTOR_MAP).fillna('Other')
+    prev_close = pd.to_numeric(df['prev_close'], errors='coerce')
+    df['change'] = (df['close'] - prev_close).round(2)
+    df['change_pct'] = (df['change'] / prev_close * 100).round(2)
+    df = df.sort_values('change_pct', ascending=False, na_position='last').reset_index(drop=True)
+
+    change = df['change_pct']
+    breadth = {
+        'advances': int((change > 0).sum()),
+        'declines': int((change < 0).sum()),
+        'unchanged': int((change == 0).sum()),
+    }
+    breadth['advance_decline_ratio'] = (
+        round(breadth['advances'] / breadth['declines'], 2) if breadth['declines'] else None
+    )
+
+    mover_cols = ['symbol', 'close', 'change', 'change_pct']
+    # df is sorted by change_pct descending, so gainers lead and losers trail
+    top_gainers = df[change > 0].head(top_n)
+    top_losers = df[change < 0].tail(top_n).iloc[::-1]
+    volume_leaders = df.nlargest(top_n, 'volume')
+
+    # Sector returns: equal-weighted mean and turnover (close * volume) weighted mean
+    turnover = df['close'] * df['volume']
+    weighted = change * turnover
+    sectors = (
+        df.assign(turnover=turnover.where(change.notna()), weighted=weighted)
+        .groupby('sector')
+        .agg(stocks=('symbol', 'size'),
+             avg_change_pct=('change_pct', 'mean'),
+             weighted=('weighted', 'sum'),
+             turnover=('turnover', 'sum'))
+    )
+    sectors['weighted_change_pct'] = sectors['weighted'] / sectors['turnover'].replace(0, np.nan)
+    sectors = (
+        sectors.drop(columns=['weighted', 'turnover'])
+        .round(2)
+        .sort_values('weighted_change_pct', ascending=False)
+        .reset_index()
+    )
+
+    analytics = {
+        'breadth': breadth,
+        'top_gainers': _records(top_gainers[mover_cols]),
+        'top_losers': _records(top_losers[mover_cols]),
+        'volume_leaders': _records(volume_leaders[['symbol', 'volume', 'change_pct']]),
+        'sectors': _records(sectors),
+    }
+    return _records(df), analytics
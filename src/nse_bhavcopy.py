@@ -0,0 +1,180 @@
+import requests
+import pandas as pd
+import os
+import io
+import time
+import zipfile
+from datetime import datetime, timedelta
+
+from custom_dirs import DataDirectory
+from windowed_reader import upsert_csv
+
+BHAVCOPY_URL = "https://nsearchives.nseindia.com/content/cm/BhavCopy_NSE_CM_0_0_0_{date}_F_0000.csv.zip"
+
+# Bhavcopy (UDiFF) column -> OHLCV store column
+BHAVCOPY_COLUMNS = {
+    'TradDt': 'date',
+    'TckrSymb': 'symbol',
+    'SctySrs': 'series',
+    'OpnPric': 'open',
+    'HghPric': 'high',
+    'LwPric': 'low',
+    'ClsPric': 'close',
+    'PrvsClsgPric': 'prev_close',
+    'TtlTradgVol': 'volume',
+}
+
+OHLCV_COLUMNS = ['date', 'symbol', 'open', 'high', 'low', 'close', 'prev_close', 'volume']
+
+
+def get_nse_session():
+    """Creates a requests session with the cookies NSE expects."""
+    headers = {
+        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+        "Accept": "*/*",
+        "Accept-Language": "en-US,en;q=0.9",
+        "Accept-Encoding": "gzip, deflate, br",
+        "Connection": "keep-alive",
+        "Referer": "https://www.nseindia.com/",
+    }
+    session = requests.Session()
+    session.headers.update(headers)
+    # Visit the main page once to establish session cookies
+    session.get("https://www.nseindia.com", timeout=10).raise_for_status()
+    time.sleep(1)
+    return session
+
+
+def download_bhavcopy(trade_date, session=None):
+    """Downloads the zipped bhavcopy for a trading day. Returns the raw bytes or None."""
+    url = BHAVCOPY_URL.format(date=trade_date.strftime('%Y%m%d'))
+    try:
+        if session is None:
+            session = get_nse_session()
+        response = session.get(url, timeout=30)
+        if response.status_code == 404:
+            print(f"No bhavcopy published for {trade_date.date()} (holiday or not yet available)")
+            return None
+        response.raise_for_status()
+        return response.content
+    except requests.exceptions.RequestException as e:
+        print(f"Error downloading bhavcopy for {trade_date.date()}: {e}")
+        return None
+
+
+def parse_bhavcopy(archive, symbols=None, chunksize=50000):
+    """Parses a zipped bhavcopy and keeps only the equity rows for the given symbols.
+
+    `archive` may be raw bytes or a path to a .zip file. The CSV is decompressed
+    as a stream and filtered chunk by chunk, so the full day's file is never
+    held in memory. Raises zipfile.BadZipFile or ValueError if the payload is
+    not a bhavcopy archive (NSE answers blocked requests with an HTML page).
+    """
+    if symbols is None:
+        # Imported here because nifty50 imports this module
+        from nifty50 import get_nifty50_symbols
+        symbols = get_nifty50_symbols()
+    universe = {s.replace('.NS', '') for s in symbols}
+
+    if isinstance(archive, (bytes, bytearray)):
+        archive = io.BytesIO(archive)
+
+    chunks = []
+    with zipfile.ZipFile(archive) as zf:
+        csv_names = [n for n in zf.namelist() if n.lower().endswith('.csv')]
+        if not csv_names:
+            raise ValueError("Archive does not contain a CSV file")
+        csv_name = csv_names[0]
+        with zf.open(csv_name) as f:
+            reader = pd.read_csv(f, usecols=list(BHAVCOPY_COLUMNS), chunksize=chunksize)
+            for chunk in reader:
+                chunk = chunk.rename(columns=BHAVCOPY_COLUMNS)
+                mask = chunk['symbol'].isin(universe) & (chunk['series'] == 'EQ')
+                chunks.append(chunk.loc[mask, OHLCV_COLUMNS])
+
+    if not chunks:
+        return pd.DataFrame(columns=OHLCV_COLUMNS)
+    df = pd.concat(chunks, ignore_index=True)
+    df['date'] = pd.to_datetime(df['date']).dt.strftime('%d/%m/%Y')
+    df['volume'] = df['volume'].astype('int64')
+    return df
+
+
+def save_ohlcv_to_csv(df, filename=os.path.join(DataDirectory.path, "nifty50_ohlcv.csv")):
+    """Appends parsed bhavcopy rows to the OHLCV store."""
+    if df is None or df.empty:
+        print("No OHLCV data to save.")
+        return
+    try:
+        upsert_csv(filename, df, ['date', 'symbol'], keep='last')
+        print(f"OHLCV data saved to {filename}")
+    except IOError as e:
+        print(f"Error saving data to {filename}: {e}")
+
+
+def _parse_or_skip(archive, trade_date, symbols=None):
+    """Parses an archive, logging and returning None if it is not a valid bhavcopy."""
+    try:
+        return parse_bhavcopy(archive, symbols=symbols)
+    except (zipfile.BadZipFile, ValueError) as e:
+        print(f"Skipping bhavcopy for {trade_date.date()}: invalid archive ({e})")
+        return None
+
+
+def bhavcopy_to_stock_data(df):
+    """Converts parsed bhavcopy rows into the per-stock records used by nifty50_data.json."""
+    stock_data = []
+    for row in df.itertuples(index=False):
+        stock_data.append({
+            'date': row.date,
+            'symbol': row.symbol,
+            'open': round(float(row.open), 2),
+            'close': round(float(row.close), 2),
+            'high': round(float(row.high), 2),
+            'low': round(float(row.low), 2),
+            'volume': int(row.volume),
+            'prev_close': round(float(row.prev_close), 2)
+        })
+    return stock_data
+
+
+def ingest_bhavcopy(trade_date=None, symbols=None, session=None):
+    """Downloads, filters and stores a single day's bhavcopy. Returns the parsed rows."""
+    if trade_date is None:
+        trade_date = datetime.now()
+    archive = download_bhavcopy(trade_date, session=session)
+    if archive is None:
+        return None
+    df = _parse_or_skip(archive, trade_date, symbols=symbols)
+    if df is None:
+        return None
+    print(f"Parsed {len(df)} rows from bhavcopy for {trade_date.date()}")
+    save_ohlcv_to_csv(df)
+    return df
+
+
+def backfill_bhavcopy(start_date, end_date, symbols=None):
+    """Ingests every weekday between start_date and end_date (inclusive) with one NSE session."""
+    session = get_nse_session()
+    frames = []
+    day = start_date
+    while day <= end_date:
+        if day.weekday() < 5:
+            archive = download_bhavcopy(day, session=session)
+            df = _parse_or_skip(archive, day, symbols=symbols) if archive is not None else None
+            if df is not None:
+                frames.append(df)
+            time.sleep(0.5)
+        day += timedelta(days=1)
+    if frames:
+        save_ohlcv_to_csv(pd.concat(frames, ignore_index=True))
+    print(f"Backfilled {len(frames)} trading days from {start_date.date()} to {end_date.date()}")
+
+
+def main():
+    """Main function to orchestrate the process."""
+    ingest_bhavcopy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+import subprocess
+import hashlib
+import shutil
+import json
+import glob
+import os
+import time
+from dotenv import load_dotenv
+
+from custom_dirs import RootDirectory
+
+load_dotenv(os.path.join(os.path.dirname(__file__), '.env'))
+
+# Site artifacts, as glob patterns relative to the repo root
+ARTIFACTS = [
+    "index.html",
+    "data/*.csv",
+    "data/*.json",
+    "src/*.png",
+]
+
+# Local state that lives in data/ but is not part of the site
+EXCLUDE = {"data/alert_state.json", "data/run_journal.json"}
+
+MANIFEST_NAME = ".publish_manifest.json"
+
+# Local size/mtime -> hash cache, kept outside every published tree so that
+# touching a file without changing it does not change the manifest
+CACHE_FILE = os.path.join(RootDirectory.path, ".publish_cache.json")
+
+PUBLISH_TARGET = os.getenv("PUBLISH_TARGET", "dir")  # 'dir' or 'git'
+PUBLISH_DIR = os.getenv("PUBLISH_DIR", os.path.join(RootDirectory.path, "site"))
+PUBLISH_WORKTREE = os.getenv("PUBLISH_WORKTREE", os.path.join(RootDirectory.path, "site-git"))
+PUBLISH_BRANCH = os.getenv("PUBLISH_BRANCH", "gh-pages")
+
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def build_manifest(cache=None, root=RootDirectory.path):
+    """Maps each artifact's relative path to its hash, size and mtime.
+
+    Files whose size and mtime match the cache entry reuse the stored hash
+    instead of being read again.
+    """
+    cache = cache or {}
+    manifest = {}
+    for pattern in ARTIFACTS:
+        for path in sorted(glob.glob(os.path.join(root, pattern))):
+            rel = os.path.relpath(path, root).replace(os.sep, '/')
+            if rel in EXCLUDE:
+                continue
+            stat = os.stat(path)
+            old = cache.get(rel)
+            if old and old['size'] == stat.st_size and old['mtime_ns'] == stat.st_mtime_ns:
+                digest = old['sha256']
+            else:
+                digest = _file_hash(path)
+            manifest[rel] = {'sha256': digest, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    return manifest
+
+
+def _load_json(path):
+    if os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return {}
+
+
+def load_manifest(target_dir):
+    return _load_json(os.path.join(target_dir, MANIFEST_NAME))
+
+
+def publish_to_directory(target_dir=PUBLISH_DIR, root=RootDirectory.path):
+    """Copies changed artifacts to target_dir and prunes ones no longer produced.
+
+    Returns a dict with the lists of copied and removed paths.
+    """
+    os.makedirs(target_dir, exist_ok=True)
+    previous = load_manifest(target_dir)
+    caches = _load_json(CACHE_FILE)
+    cache_key = os.path.abspath(target_dir)
+    stats = build_manifest(caches.get(cache_key), root=root)
+    # The published manifest only records content, so it changes only when content does
+    manifest = {rel: {'sha256': e['sha256'], 'size': e['size']} for rel, e in stats.items()}
+
+    copied = []
+    for rel, entry in manifest.items():
+        dest = os.path.join(target_dir, rel)
+        if previous.get(rel, {}).get('sha256') == entry['sha256'] and os.path.exists(dest):
+            continue
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        shutil.copy2(os.path.join(root, rel), dest)
+        copied.append(rel)
+
+    removed = []
+    for rel in previous:
+        if rel not in manifest:
+            dest = os.path.join(target_dir, rel)
+            if os.path.exists(dest):
+                os.remove(dest)
+            removed.append(rel)
+
+    if manifest != previous:
+        with open(os.path.join(target_dir, MANIFEST_NAME), 'w') as f:
+            json.dump(manifest, f, indent=4)
+    caches[cache_key] = stats
+    with open(CACHE_FILE, 'w') as f:
+        json.dump(caches, f, indent=4)
+    print(f"Published to {target_dir}: {len(copied)} copied, {len(removed)} removed, "
+          f"{len(manifest) - len(copied)} unchanged")
+    return {'copied': copied, 'removed': removed}
+
+
+def _ensure_site_worktree(worktree, branch):
+    """Checks out the site branch in a separate worktree.
+
+    The branch is taken from the local repo or, on a fresh clone, from
+    origin; an orphan branch is created only when it exists in neither.
+    """
+    if os.path.exists(worktree):
+        return
+    repo = RootDirectory.path
+    # Ignore failures: there may be no origin, or the branch may not exist there yet
+    subprocess.run(["git", "fetch", "origin", branch], cwd=repo, capture_output=True)
+
+    def ref_exists(ref):
+        return subprocess.run(["git", "rev-parse", "--verify", "--quiet", ref],
+                              cwd=repo, capture_output=True).returncode == 0
+
+    if ref_exists(f"refs/heads/{branch}"):
+        subprocess.run(["git", "worktree", "add", worktree, branch], cwd=repo, check=True)
+    elif ref_exists(f"refs/remotes/origin/{branch}"):
+        subprocess.run(["git", "worktree", "add", "-B", branch, worktree, f"origin/{branch}"],
+                       cwd=repo, check=True)
+    else:
+        subprocess.run(["git", "worktree", "add", "--detach", worktree], cwd=repo, check=True)
+        subprocess.run(["git", "checkout", "--orphan", branch], cwd=worktree, check=True)
+        subprocess.run(["git", "rm", "-rf", "--quiet", "."], cwd=worktree, check=True)
+
+
+def _check_site_worktree(worktree, branch):
+    """Refuses to stage anything unless worktree is its own git checkout of branch.
+
+    A plain directory inside the repo would otherwise make `git add -A` stage
+    the main working tree and commit it to the current branch.
+    """
+    toplevel = subprocess.run(["git", "-C", worktree, "rev-parse", "--show-toplevel"],
+                              capture_output=True, text=True)
+    if (toplevel.returncode != 0
+            or os.path.realpath(toplevel.stdout.strip()) != os.path.realpath(worktree)):
+        raise RuntimeError(f"{worktree} is not a git worktree of its own; "
+                           f"remove it or set PUBLISH_WORKTREE to another path")
+    current = subprocess.run(["git", "-C", worktree, "symbolic-ref", "--short", "HEAD"],
+                             capture_output=True, text=True)
+    if current.returncode != 0 or current.stdout.strip() != branch:
+        raise RuntimeError(f"{worktree} is not on branch {branch}")
+
+
+def publish_to_git_branch(branch=PUBLISH_BRANCH, worktree=PUBLISH_WORKTREE, push=True):
+    """Publishes artifacts to a branch that holds only the site, committing just the deltas."""
+    try:
+        _ensure_site_worktree(worktree, branch)
+        _check_site_worktree(worktree, branch)
+        changes = publish_to_directory(worktree)
+        # The worktree holds only site files, so staging everything picks up
+        # exactly the deltas (including any left over from a failed run)
+        subprocess.run(["git", "add", "-A"], cwd=worktree, check=True)
+        status = subprocess.run(["git", "status", "--porcelain"], cwd=worktree,
+                                capture_output=True, text=True, check=True)
+        if not status.stdout.strip():
+            print("No artifact changes to publish")
+            return changes
+        subprocess.run(["git", "commit", "-m", f"Publish {time.ctime()}"], cwd=worktree, check=True)
+        if push:
+            subprocess.run(["git", "push", "origin", branch], cwd=worktree, check=True)
+        print("Git publish completed")
+        return changes
+    except (subprocess.CalledProcessError, RuntimeError) as e:
+        print(f"Error: {e}")
+        return None
+
+
+def publish():
+    """Publishes site artifacts to the configured target."""
+    if PUBLISH_TARGET == "git":
+        return publish_to_git_branch()
+    return publish_to_directory()
+
+
+if __name__ == "__main__":
+    publish()
@@ -0,0 +1,210 @@
+import pandas as pd
+import json
+import os
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from custom_dirs import DataDirectory
+
+# Stored series: CSV file, date column, optional column splitting the file
+# into separate series, and how each column aggregates when resampling.
+STORES = {
+    'fii_dii': {
+        'file': "fii_dii_buy_sell_data.csv",
+        'date_col': 'date',
+        'group_col': 'category',
+        'agg': {'buyValue': 'sum', 'sellValue': 'sum', 'netValue': 'sum'},
+    },
+    'usd_inr': {
+        'file': "usd_to_inr_exchange_rate.csv",
+        'date_col': 'time_last_update_utc',
+        'group_col': 'Currency',
+        'agg': {'Rate': 'last'},
+    },
+    'gold': {
+        'file': "gold_price_data.csv",
+        'date_col': 'date',
+        'group_col': None,
+        'agg': {'gold_24k_price': 'last', 'gold_22k_price': 'last'},
+    },
+    'nifty50': {
+        'file': "nifty50_ohlcv.csv",
+        'date_col': 'date',
+        'group_col': 'symbol',
+        'agg': {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last',
+                'prev_close': 'first', 'volume': 'sum'},
+    },
+}
+
+GRANULARITIES = {'D': 'D', 'W': 'W', 'M': 'ME'}
+
+_lock = threading.Lock()
+_frames = {}   # store -> (version, {group: date-indexed frame})
+
+
+class LRUCache:
+    """Small least-recently-used cache for query results."""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+
+    def get(self, key):
+        if key not in self._data:
+            return None
+        self._data.move_to_end(key)
+        return self._data[key]
+
+    def put(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, store):
+        """Drops every cached result for a store."""
+        for key in [k for k in self._data if k[0] == store]:
+            del self._data[key]
+
+    def __len__(self):
+        return len(self._data)
+
+
+result_cache = LRUCache()
+
+
+def store_path(store):
+    return os.path.join(DataDirectory.path, STORES[store]['file'])
+
+
+def store_version(store):
+    """Write version of a store; changes whenever the file is rewritten."""
+    try:
+        stat = os.stat(store_path(store))
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _load_store(store, version):
+    """Reads a store once per write version into sorted, date-indexed frames per group."""
+    spec = STORES[store]
+    df = pd.read_csv(store_path(store))
+    df[spec['date_col']] = pd.to_datetime(df[spec['date_col']], format='mixed', dayfirst=True)
+    df = df.dropna(subset=[spec['date_col']]).sort_values(spec['date_col'], kind='stable')
+    df = df.set_index(spec['date_col'])
+    if spec['group_col']:
+        groups = {str(k): g.drop(columns=spec['group_col']) for k, g in df.groupby(spec['group_col'])}
+    else:
+        groups = {None: df}
+    _frames[store] = (version, groups)
+    result_cache.invalidate(store)
+    return groups
+
+
+def _get_groups(store):
+    version = store_version(store)
+    if version is None:
+        raise FileNotFoundError(f"Store file not found: {store_path(store)}")
+    cached = _frames.get(store)
+    if cached is not None and cached[0] == version:
+        return version, cached[1]
+    return version, _load_store(store, version)
+
+
+def query_series(store, start=None, end=None, granularity='D', group=None, columns=None):
+    """Returns store values between start and end (inclusive) aggregated to the granularity.
+
+    `group` selects the series within a grouped store (e.g. 'FII/FPI *', 'INR'
+    or a Nifty symbol). Results are served from an LRU cache that is
+    invalidated when the store file changes; treat the returned frame as
+    read-only.
+    """
+    if store not in STORES:
+        raise ValueError(f"Unknown store: {store}")
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unknown granularity: {granularity}")
+    if isinstance(columns, list):
+        columns = tuple(columns)
+
+    with _lock:
+        version, groups = _get_groups(store)
+        key = (store, version, group, str(start), str(end), granularity, columns)
+        result = result_cache.get(key)
+        if result is not None:
+            return result
+
+        if STORES[store]['group_col'] and group is None:
+            raise ValueError(f"Store {store} needs a group, one of: {sorted(groups)}")
+        df = groups.get(group)
+        if df is None:
+            raise ValueError(f"Unknown group for {store}: {group}")
+
+        # Binary search on the sorted date index
+        index = df.index
+        lo = index.searchsorted(pd.Timestamp(start), side='left') if start else 0
+        hi = index.searchsorted(pd.Timestamp(end), side='right') if end else len(index)
+        result = df.iloc[lo:hi]
+
+        # Aggregate to the granularity, which also collapses duplicate rows for a
+        # day; bins without any rows are dropped rather than filled
+        agg = {c: a for c, a in STORES[store]['agg'].items() if c in result.columns}
+        resampler = result.resample(GRANULARITIES[granularity])
+        counts = resampler.size()
+        result = resampler.agg(agg)[counts > 0]
+        if columns:
+            result = result[list(columns)]
+
+        result_cache.put(key, result)
+        return result
+
+
+def _to_json(df):
+    out = df.reset_index()
+    date_col = out.columns[0]
+    out[date_col] = out[date_col].dt.strftime('%Y-%m-%d')
+    return out.astype(object).where(out.notna(), None).to_dict(orient='records')
+
+
+class QueryRequestHandler(BaseHTTPRequestHandler):
+    """Serves GET /series?store=..&start=..&end=..&granularity=..&group=..&columns=a,b"""
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        if parsed.path != '/series':
+            self._send(404, {'error': 'Not found'})
+            return
+        params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        try:
+            columns = params['columns'].split(',') if params.get('columns') else None
+            df = query_series(params.get('store'), start=params.get('start'), end=params.get('end'),
+                              granularity=params.get('granularity', 'D'), group=params.get('group'),
+                              columns=columns)
+            self._send(200, _to_json(df))
+        except (ValueError, KeyError) as e:
+            self._send(400, {'error': str(e)})
+        except FileNotFoundError as e:
+            self._send(404, {'error': str(e)})
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def main():
+    """Starts the local query endpoint."""
+    port = int(os.getenv("QUERY_API_PORT", 8050))
+    server = ThreadingHTTPServer(('127.0.0.1', port), QueryRequestHandler)
+    print(f"Query API listening on http://127.0.0.1:{port}/series")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
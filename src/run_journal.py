@@ -0,0 +1,74 @@
+import json
+import os
+import traceback
+from datetime import datetime
+
+from custom_dirs import DataDirectory
+
+JOURNAL_FILE = os.path.join(DataDirectory.path, "run_journal.json")
+KEEP_DAYS = 30
+
+
+def load_journal(filename=JOURNAL_FILE):
+    if os.path.exists(filename):
+        try:
+            with open(filename) as f:
+                return json.load(f)
+        except ValueError as e:
+            print(f"Ignoring unreadable run journal {filename}: {e}")
+    return {}
+
+
+def save_journal(journal, filename=JOURNAL_FILE):
+    """Writes the journal atomically, keeping only the most recent trading days."""
+    for day in sorted(journal)[:-KEEP_DAYS]:
+        del journal[day]
+    tmp = filename + ".tmp"
+    with open(tmp, 'w') as f:
+        json.dump(journal, f, indent=4)
+    os.replace(tmp, filename)
+
+
+def run_stages(stages, trade_date=None, filename=JOURNAL_FILE):
+    """Runs (name, func, depends_on) stages, resuming from the journal for trade_date.
+
+    A stage is skipped when it already completed for the trading day, unless
+    one of the stages it depends on was re-run in this invocation. A stage
+    fails by raising; the failure is recorded and the remaining stages still
+    run. Returns True when every stage has completed.
+    """
+    if trade_date is None:
+        trade_date = datetime.now().strftime('%Y-%m-%d')
+    journal = load_journal(filename)
+    day = journal.setdefault(trade_date, {})
+    executed = set()
+
+    for name, func, depends_on in stages:
+        entry = day.get(name, {})
+        rerun_deps = executed.intersection(depends_on)
+        if entry.get('status') == 'done' and not rerun_deps:
+            print(f"Skipping {name}: already completed at {entry['finished_at']}")
+            continue
+
+        print(f"Running stage {name}...")
+        day[name] = {'status': 'running', 'started_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                     'attempts': entry.get('attempts', 0) + 1}
+        save_journal(journal, filename)
+        try:
+            func()
+            day[name]['status'] = 'done'
+            executed.add(name)
+        except Exception as e:
+            day[name]['status'] = 'failed'
+            day[name]['error'] = f"{type(e).__name__}: {e}"
+            print(f"Stage {name} failed: {e}")
+            traceback.print_exc()
+        day[name]['finished_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        save_journal(journal, filename)
+
+    failed = [name for name, _, _ in stages if day.get(name, {}).get('status') != 'done']
+    if failed:
+        print(f"Incomplete stages for {trade_date}: {', '.join(failed)}. Rerun to resume.")
+    else:
+        print(f"All stages completed for {trade_date}")
+    return not failed
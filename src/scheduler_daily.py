@@ -1,43 +1,91 @@
-import subprocess
-import time
-from run_all_reports import main as all_reports_main
-import os
-from custom_dirs import RootDirectory
+# Configure matplotlib to use Agg backend
+import matplotlib_config
+
+from datetime import datetime, timedelta
+
+from fii_dii_report import get_fii_dii_data, save_data_to_csv, load_data_from_csv, create_visualization
+from dollar_vs_inr import get_exchange_rate_data, create_dataframe, load_exchange_rate_data, plot_and_save_usd_to_inr, url
+from gold_price_india import get_gold_price_data, save_gold_data_to_csv, plot_gold_price_trend
 from nifty50 import process_and_save_data
+from publisher import publish
+from run_journal import run_stages
+
+
+def fetch_fii_dii():
+    data = get_fii_dii_data()
+    if not data:
+        raise RuntimeError("No FII/DII data received from API")
+    if not save_data_to_csv(data):
+        raise RuntimeError("Saving FII/DII data failed")
+
+
+def plot_fii_dii():
+    df = load_data_from_csv(start_date=datetime.today() - timedelta(days=30))
+    if df is None:
+        raise RuntimeError("Loading FII/DII data failed")
+    if df.empty:
+        # No trading data in the window (e.g. a long market closure) is not a failure
+        print("No FII/DII data in the last 30 days, skipping visualization")
+        return
+    if not create_visualization(df):
+        raise RuntimeError("FII/DII visualization failed")
+
+
+def fetch_usd_inr():
+    if create_dataframe(get_exchange_rate_data(url)) is None:
+        raise RuntimeError("No exchange rate data received from API")
+
+
+def plot_usd_inr():
+    if not plot_and_save_usd_to_inr(load_exchange_rate_data()):
+        raise RuntimeError("USD/INR plot failed")
+
+
+def fetch_gold():
+    # No fallback prices here: a failed fetch is retried on the next run instead
+    data = get_gold_price_data(use_fallback=False)
+    if data is None:
+        raise RuntimeError("No gold price data received")
+    if not save_gold_data_to_csv(data):
+        raise RuntimeError("Saving gold price data failed")
+
+
+def plot_gold():
+    if not plot_gold_price_trend():
+        raise RuntimeError("Gold price plot failed")
+
+
+def fetch_nifty50():
+    output_data = process_and_save_data()
+    if not output_data['stocks']:
+        raise RuntimeError("No Nifty 50 stock data fetched")
+
+
+def publish_artifacts():
+    if publish() is None:
+        raise RuntimeError("Publish failed")
+
+
+# (stage name, function, stages whose re-run invalidates this one)
+STAGES = [
+    ('fii_dii_fetch', fetch_fii_dii, []),
+    ('fii_dii_plot', plot_fii_dii, ['fii_dii_fetch']),
+    ('usd_inr_fetch', fetch_usd_inr, []),
+    ('usd_inr_plot', plot_usd_inr, ['usd_inr_fetch']),
+    ('gold_fetch', fetch_gold, []),
+    ('gold_plot', plot_gold, ['gold_fetch']),
+    ('nifty50_fetch', fetch_nifty50, []),
+    ('publish', publish_artifacts,
+     ['fii_dii_plot', 'usd_inr_plot', 'gold_plot', 'nifty50_fetch']),
+]
 
-def git_workflow():
-    try:
-        print(f"Current directory: {os.getcwd()}")
-        # Set the repo path (replace with your actual path)
-        repo_path = RootDirectory.path
-        os.chdir(repo_path)
-        print(f"Switched to: {os.getcwd()}")
-        # check git is accessible
-        subprocess.run(["git", "--version"], check=True)
-        # Add files
-        subprocess.run(["git", "add", "."], check=True)
-        # Commit
-        subprocess.run(["git", "commit", "-m", f"Auto commit {time.ctime()}"], check=True)
-        # Optional: Push
-        subprocess.run(["git", "push"], check=True)
-        print("Git workflow completed")
-    except subprocess.CalledProcessError as e:
-        print(f"Error: {e}")
 
 def main():
     try:
-        # Run all existing reports
-        all_reports_main()
-        
-        # Fetch Nifty 50 data
-        print("Fetching Nifty 50 data...")
-        process_and_save_data()
-        print("Nifty 50 data fetched successfully")
-        
-        # Run git workflow
-        git_workflow()
+        # Run each stage, resuming only failed or incomplete ones for today
+        run_stages(STAGES)
     except Exception as e:
         print(f"Error in main workflow: {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
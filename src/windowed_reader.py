@@ -0,0 +1,202 @@
+import pandas as pd
+import csv
+import hashlib
+import io
+import json
+import os
+
+CHUNKSIZE = 10000
+
+# Rows per offset-index checkpoint
+INDEX_BLOCK = 256
+
+# Files smaller than this are streamed from the start without an offset index
+INDEX_MIN_BYTES = 1 << 20
+
+# Bytes hashed at the end of an indexed file to recognise appends
+TAIL_BYTES = 4096
+
+# Low-cardinality text columns stored as pandas categoricals
+CATEGORY_COLUMNS = ['category', 'Currency', 'symbol']
+
+
+def _parse_dates(values):
+    return pd.to_datetime(values, format='mixed', dayfirst=True, errors='coerce')
+
+
+def compact_frame(df):
+    """Downcasts float columns to float32 and low-cardinality text columns to category."""
+    for column in df.columns:
+        if column in CATEGORY_COLUMNS:
+            df[column] = df[column].astype('category')
+        elif pd.api.types.is_float_dtype(df[column]):
+            df[column] = df[column].astype('float32')
+    return df
+
+
+def index_path(filename):
+    return filename + ".idx"
+
+
+def _tail_hash(filename, size):
+    """Hash of the last TAIL_BYTES bytes before `size`, used to detect pure appends."""
+    with open(filename, 'rb') as f:
+        f.seek(max(0, size - TAIL_BYTES))
+        return hashlib.sha1(f.read(min(size, TAIL_BYTES))).hexdigest()
+
+
+def build_offset_index(filename, date_col, resume=None):
+    """Streams the file and records byte-offset checkpoints for date seeks.
+
+    Each checkpoint stores the offset of a row and the latest date among all
+    rows before it, so seeking there is safe even if the file is not sorted.
+    Passing a previous index as `resume` rescans only from its last checkpoint,
+    which is valid when the file has only been appended to since.
+    """
+    stat = os.stat(filename)
+    checkpoints = []
+    latest = None
+    with open(filename, 'rb') as f:
+        header = next(csv.reader([f.readline().decode('utf-8')]))
+        position = header.index(date_col)
+        if resume and resume['checkpoints']:
+            checkpoints = resume['checkpoints'][:-1]
+            offset, last = resume['checkpoints'][-1]
+            latest = pd.Timestamp(last) if last is not None else None
+            f.seek(offset)
+        else:
+            offset = f.tell()
+        block_dates = []
+        line = f.readline()
+        while line:
+            if len(block_dates) % INDEX_BLOCK == 0:
+                if block_dates:
+                    block_max = _parse_dates(pd.Series(block_dates)).max()
+                    if pd.notna(block_max) and (latest is None or block_max > latest):
+                        latest = block_max
+                    block_dates = []
+                checkpoints.append([offset, latest.isoformat() if latest is not None else None])
+            block_dates.append(next(csv.reader([line.decode('utf-8')]))[position])
+            offset = f.tell()
+            line = f.readline()
+
+    index = {'date_col': date_col, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+             'tail_sha1': _tail_hash(filename, stat.st_size), 'checkpoints': checkpoints}
+    with open(index_path(filename), 'w') as f:
+        json.dump(index, f)
+    return index
+
+
+def load_offset_index(filename, date_col):
+    """Returns the offset index for filename, extending or rebuilding it if the file changed."""
+    stat = os.stat(filename)
+    path = index_path(filename)
+    if os.path.exists(path):
+        try:
+            with open(path) as f:
+                index = json.load(f)
+            if index['date_col'] == date_col:
+                if index['size'] == stat.st_size and index['mtime_ns'] == stat.st_mtime_ns:
+                    return index
+                # Rows were only appended if the bytes before the old end are unchanged
+                if (stat.st_size > index['size']
+                        and _tail_hash(filename, index['size']) == index['tail_sha1']):
+                    return build_offset_index(filename, date_col, resume=index)
+        except (ValueError, KeyError):
+            pass
+    return build_offset_index(filename, date_col)
+
+
+def _seek_offset(index, start):
+    """Byte offset of the last checkpoint before which every row is older than start."""
+    offset = None
+    for checkpoint_offset, latest in index['checkpoints']:
+        if latest is not None and pd.Timestamp(latest) >= start:
+            break
+        offset = checkpoint_offset
+    return offset
+
+
+def read_csv_window(filename, date_col, start=None, end=None, chunksize=CHUNKSIZE, use_index=True):
+    """Reads only the rows of a CSV whose date falls between start and end (inclusive).
+
+    The file is streamed in chunks, starting from the offset index checkpoint
+    for `start` when the file is large enough to be indexed, so memory is bounded by the window rather
+    than by the length of the history. The date column is parsed and the
+    frame is compacted with compact_frame.
+    """
+    start = pd.Timestamp(start) if start is not None else None
+    end = pd.Timestamp(end) if end is not None else None
+
+    with open(filename, 'rb') as f:
+        header = next(csv.reader([f.readline().decode('utf-8')]))
+        if start is not None and use_index and os.path.getsize(filename) >= INDEX_MIN_BYTES:
+            offset = _seek_offset(load_offset_index(filename, date_col), start)
+            if offset is not None:
+                f.seek(offset)
+        reader = pd.read_csv(io.TextIOWrapper(f, encoding='utf-8'), names=header, header=None,
+                             chunksize=chunksize)
+        chunks = []
+        for chunk in reader:
+            chunk[date_col] = _parse_dates(chunk[date_col])
+            mask = chunk[date_col].notna()
+            if start is not None:
+                mask &= chunk[date_col] >= start
+            if end is not None:
+                mask &= chunk[date_col] <= end
+            chunks.append(compact_frame(chunk.loc[mask]))
+
+    if not chunks:
+        return compact_frame(pd.DataFrame(columns=header))
+    return compact_frame(pd.concat(chunks, ignore_index=True))
+
+
+def upsert_csv(filename, new_df, key_cols, keep='last', chunksize=CHUNKSIZE):
+    """Merges new rows into a CSV, deduplicated on key_cols, without loading the history.
+
+    Only the key columns are scanned to find rows that already exist. With
+    keep='first' those new rows are dropped; with keep='last' the old rows
+    are superseded. When nothing is superseded the new rows are simply
+    appended; otherwise the file is streamed chunk by chunk into a temporary
+    file without the superseded rows. Columns that are new to the file are
+    added, with empty values for existing rows. Returns the rows written.
+    """
+    new_df = new_df.drop_duplicates(subset=key_cols, keep=keep)
+    if not os.path.exists(filename):
+        new_df.to_csv(filename, index=False)
+        return new_df
+
+    columns = pd.read_csv(filename, nrows=0).columns.tolist()
+    extra = [c for c in new_df.columns if c not in columns]
+    new_df = new_df.reindex(columns=columns + extra)
+    new_keys = pd.MultiIndex.from_frame(new_df[key_cols].astype(str))
+
+    existing = set()
+    for chunk in pd.read_csv(filename, usecols=key_cols, dtype=str, keep_default_na=False,
+                             chunksize=chunksize):
+        keys = pd.MultiIndex.from_frame(chunk[key_cols])
+        existing.update(keys[keys.isin(new_keys)])
+
+    if keep == 'first':
+        new_df = new_df[~new_keys.isin(list(existing))]
+        superseded = set()
+    else:
+        superseded = existing
+
+    if not superseded and not extra:
+        # Earlier bytes stay untouched, so the offset index can be extended
+        new_df.to_csv(filename, mode='a', header=False, index=False)
+        return new_df
+
+    # Read everything as text so rewritten rows are byte-for-byte unchanged
+    tmp = filename + ".tmp"
+    with open(tmp, 'w', newline='') as out:
+        pd.DataFrame(columns=columns + extra).to_csv(out, index=False)
+        for chunk in pd.read_csv(filename, dtype=str, keep_default_na=False, chunksize=chunksize):
+            if superseded:
+                keys = pd.MultiIndex.from_frame(chunk[key_cols])
+                chunk = chunk[~keys.isin(list(superseded))]
+            chunk.reindex(columns=columns + extra, fill_value='').to_csv(out, header=False, index=False)
+        new_df.to_csv(out, header=False, index=False)
+    os.replace(tmp, filename)
+    return new_df
@@ -0,0 +1,79 @@
+import pytest
+
+import alerts
+from alerts import _metric, _update_series_state, evaluate_alerts
+
+GOLD_MOVE = {'name': 'Gold move', 'source': 'gold', 'field': 'price', 'metric': 'pct_change',
+             'op': 'abs>', 'threshold': 2}
+FII_SELLING = {'name': 'FII selling', 'source': 'fii_dii', 'field': 'netValue', 'op': '<',
+               'threshold': -5000, 'filter': {'category': 'FII/FPI *'}}
+
+
+@pytest.fixture
+def sink(monkeypatch):
+    received = []
+    monkeypatch.setitem(alerts.SINKS, 'record', lambda alert: received.append(alert))
+    return received
+
+
+def config(*rules):
+    return {'rules': list(rules), 'sinks': [{'type': 'record'}]}
+
+
+def test_metric_uses_last_value_for_a_new_date():
+    series = {}
+    assert _metric(GOLD_MOVE, 100.0, series, '01/03/2025') is None
+    _update_series_state(series, 100.0, '01/03/2025')
+    assert _metric(GOLD_MOVE, 110.0, series, '02/03/2025') == pytest.approx(10.0)
+    assert _metric({'metric': 'change'}, 110.0, series, '02/03/2025') == pytest.approx(10.0)
+    assert _metric({}, 110.0, series, '02/03/2025') == 110.0
+
+
+def test_update_series_state_keeps_baseline_on_reingest():
+    series = {}
+    _update_series_state(series, 100.0, '01/03/2025')
+    _update_series_state(series, 110.0, '02/03/2025')
+    _update_series_state(series, 111.0, '02/03/2025')
+    assert series == {'prev_value': 100.0, 'last_key': '02/03/2025', 'last_value': 111.0}
+
+
+def test_reingest_compares_against_previous_date(sink):
+    state = {}
+    cfg = config(GOLD_MOVE)
+    evaluate_alerts('gold', [{'date': '01/03/2025', 'price': 100.0}], config=cfg, state=state)
+    evaluate_alerts('gold', [{'date': '02/03/2025', 'price': 101.0}], config=cfg, state=state)
+    assert sink == []
+    # A corrected value for the same date is measured against 01/03, not against itself
+    fired = evaluate_alerts('gold', [{'date': '02/03/2025', 'price': 103.0}], config=cfg, state=state)
+    assert [a['value'] for a in fired] == [3.0]
+    assert sink == fired
+
+
+def test_alert_fires_once_per_series_and_date(sink):
+    state = {}
+    cfg = config(FII_SELLING)
+    row = {'date': '03-Mar-25', 'category': 'FII/FPI *', 'netValue': -6000.0}
+    assert len(evaluate_alerts('fii_dii', [row], config=cfg, state=state)) == 1
+    assert evaluate_alerts('fii_dii', [row], config=cfg, state=state) == []
+    assert state['FII selling|FII/FPI *']['fired_key'] == '03-Mar-25'
+
+    next_day = dict(row, date='04-Mar-25')
+    assert len(evaluate_alerts('fii_dii', [next_day], config=cfg, state=state)) == 1
+    assert len(sink) == 2
+
+
+def test_filter_limits_rule_to_matching_rows(sink):
+    state = {}
+    rows = [
+        {'date': '03-Mar-25', 'category': 'DII **', 'netValue': -9000.0},
+        {'date': '03-Mar-25', 'category': 'FII/FPI *', 'netValue': -1000.0},
+    ]
+    assert evaluate_alerts('fii_dii', rows, config=config(FII_SELLING), state=state) == []
+    assert list(state) == ['FII selling|FII/FPI *']
+    assert sink == []
+
+
+def test_injected_state_is_not_persisted(sink, monkeypatch):
+    monkeypatch.setattr(alerts, 'save_state', lambda *a, **kw: pytest.fail("state was saved"))
+    evaluate_alerts('gold', [{'date': '01/03/2025', 'price': 100.0}], config=config(GOLD_MOVE),
+                    state={})
@@ -0,0 +1,24 @@
+from nifty50_analytics import compute_nifty50_analytics
+
+
+def _stock(symbol, close, prev_close, volume=100):
+    return {'symbol': symbol, 'open': close, 'close': close, 'high': close, 'low': close,
+            'volume': volume, 'prev_close': prev_close}
+
+
+def test_movers_only_list_stocks_that_moved_that_way():
+    stocks = [_stock('INFY', 4.0, 3.0), _stock('TCS', 1.0, None)]
+    _, analytics = compute_nifty50_analytics(stocks)
+    assert [s['symbol'] for s in analytics['top_gainers']] == ['INFY']
+    assert analytics['top_losers'] == []
+
+
+def test_broad_up_day_losers_exclude_gainers():
+    stocks = [_stock(f'UP{i}', 100.0 + i, 100.0) for i in range(1, 9)]
+    stocks.append(_stock('DOWN', 95.0, 100.0))
+    stocks.append(_stock('FLAT', 100.0, 100.0))
+    _, analytics = compute_nifty50_analytics(stocks, top_n=5)
+    assert [s['symbol'] for s in analytics['top_gainers']] == ['UP8', 'UP7', 'UP6', 'UP5', 'UP4']
+    assert [s['symbol'] for s in analytics['top_losers']] == ['DOWN']
+    assert analytics['breadth'] == {'advances': 8, 'declines': 1, 'unchanged': 1,
+                                    'advance_decline_ratio': 8.0}
@@ -0,0 +1,56 @@
+import os
+import zipfile
+
+import pytest
+
+from nse_bhavcopy import OHLCV_COLUMNS, bhavcopy_to_stock_data, parse_bhavcopy
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'BhavCopy_NSE_CM_0_0_0_20250304_F_0000.csv.zip')
+
+UNIVERSE = ['RELIANCE.NS', 'TCS.NS', 'HDFCBANK.NS', 'INFY.NS']
+
+
+def test_keeps_only_universe_eq_rows():
+    df = parse_bhavcopy(FIXTURE, symbols=UNIVERSE)
+    assert list(df.columns) == OHLCV_COLUMNS
+    # ZZSMALLCO / GOLDBEES are outside the universe, TCS BL and RELIANCE BE are not EQ
+    assert sorted(df['symbol']) == ['HDFCBANK', 'INFY', 'RELIANCE', 'TCS']
+
+
+def test_values_and_date_format():
+    df = parse_bhavcopy(FIXTURE, symbols=UNIVERSE).set_index('symbol')
+    assert (df['date'] == '04/03/2025').all()
+    assert df.loc['TCS', 'close'] == 3028.3
+    assert df.loc['TCS', 'prev_close'] == 3061.7
+    assert df.loc['RELIANCE', 'volume'] == 6371634
+    assert df['volume'].dtype == 'int64'
+
+
+@pytest.mark.parametrize('chunksize', [1, 2, 3, 7])
+def test_chunk_boundaries_do_not_change_result(chunksize):
+    expected = parse_bhavcopy(FIXTURE, symbols=UNIVERSE)
+    df = parse_bhavcopy(FIXTURE, symbols=UNIVERSE, chunksize=chunksize)
+    assert df.equals(expected)
+
+
+def test_accepts_raw_bytes():
+    with open(FIXTURE, 'rb') as f:
+        df = parse_bhavcopy(f.read(), symbols=['INFY'])
+    assert list(df['symbol']) == ['INFY']
+
+
+def test_no_matching_symbols_returns_empty_frame():
+    df = parse_bhavcopy(FIXTURE, symbols=['NOTLISTED.NS'])
+    assert df.empty
+    assert list(df.columns) == OHLCV_COLUMNS
+
+
+def test_rejects_non_zip_payload():
+    with pytest.raises(zipfile.BadZipFile):
+        parse_bhavcopy(b'<html>Access Denied</html>', symbols=UNIVERSE)
+
+
+def test_stock_records_carry_the_trade_date():
+    records = bhavcopy_to_stock_data(parse_bhavcopy(FIXTURE, symbols=['INFY']))
+    assert records[0]['date'] == '04/03/2025'
+    assert records[0]['symbol'] == 'INFY'
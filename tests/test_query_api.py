@@ -0,0 +1,64 @@
+import pandas as pd
+import pytest
+
+import query_api
+from custom_dirs import DataDirectory
+from query_api import query_series
+from windowed_reader import upsert_csv
+
+KEYS = ['date', 'symbol']
+
+
+def bar(date, close, symbol='INFY', volume=100):
+    return {'date': date, 'symbol': symbol, 'open': close, 'high': close, 'low': close,
+            'close': close, 'prev_close': close, 'volume': volume}
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(DataDirectory, 'path', str(tmp_path))
+    monkeypatch.setattr(query_api, '_frames', {})
+    monkeypatch.setattr(query_api, 'result_cache', query_api.LRUCache())
+    filename = str(tmp_path / 'nifty50_ohlcv.csv')
+    rows = [bar('03/03/2025', 10.0), bar('04/03/2025', 11.0), bar('04/03/2025', 50.0, symbol='TCS'),
+            bar('31/03/2025', 12.0)]
+    pd.DataFrame(rows).to_csv(filename, index=False)
+    return filename
+
+
+def test_repeated_query_is_served_from_cache(store):
+    first = query_series('nifty50', group='INFY')
+    assert query_series('nifty50', group='INFY') is first
+    assert len(query_api.result_cache) == 1
+
+
+def test_query_reflects_rows_appended_by_upsert(store):
+    assert list(query_series('nifty50', group='INFY')['close']) == [10.0, 11.0, 12.0]
+    upsert_csv(store, pd.DataFrame([bar('01/04/2025', 13.0)]), KEYS, keep='last')
+    assert list(query_series('nifty50', group='INFY')['close']) == [10.0, 11.0, 12.0, 13.0]
+
+
+def test_query_reflects_rows_replaced_by_upsert(store):
+    query_series('nifty50', group='INFY')
+    upsert_csv(store, pd.DataFrame([bar('04/03/2025', 20.0)]), KEYS, keep='last')
+    assert list(query_series('nifty50', group='INFY')['close']) == [10.0, 20.0, 12.0]
+
+
+@pytest.mark.parametrize('granularity, expected', [
+    ('W', ['2025-03-09', '2025-04-06']),
+    ('M', ['2025-03-31']),
+])
+def test_resampling_drops_empty_bins(store, granularity, expected):
+    result = query_series('nifty50', granularity=granularity, group='INFY')
+    assert [d.strftime('%Y-%m-%d') for d in result.index] == expected
+    assert result['close'].iloc[0] == (11.0 if granularity == 'W' else 12.0)
+    assert result['volume'].iloc[0] == (200 if granularity == 'W' else 300)
+
+
+def test_daily_granularity_collapses_duplicate_rows(store):
+    with open(store, 'a') as f:
+        pd.DataFrame([bar('04/03/2025', 15.0)]).to_csv(f, header=False, index=False)
+    result = query_series('nifty50', start='2025-03-04', end='2025-03-04', group='INFY')
+    assert len(result) == 1
+    assert result['close'].iloc[0] == 15.0
+    assert result['volume'].iloc[0] == 200
@@ -0,0 +1,82 @@
+import pytest
+
+from run_journal import load_journal, run_stages, save_journal
+
+DAY = '2025-03-04'
+
+
+class Stage:
+    """Stage callable that records its calls and fails while `fail` is set."""
+
+    def __init__(self, calls, name, fail=False):
+        self.calls, self.name, self.fail = calls, name, fail
+
+    def __call__(self):
+        self.calls.append(self.name)
+        if self.fail:
+            raise RuntimeError(f"{self.name} broke")
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return str(tmp_path / 'run_journal.json')
+
+
+def pipeline(calls, fetch_fails=False, plot_fails=False):
+    fetch = Stage(calls, 'fetch', fetch_fails)
+    plot = Stage(calls, 'plot', plot_fails)
+    return [('fetch', fetch, []), ('plot', plot, ['fetch'])]
+
+
+def mark_failed(journal, name):
+    entries = load_journal(journal)
+    entries[DAY][name]['status'] = 'failed'
+    save_journal(entries, journal)
+
+
+def test_completed_stages_are_skipped(journal):
+    calls = []
+    assert run_stages(pipeline(calls), DAY, journal)
+    assert run_stages(pipeline(calls), DAY, journal)
+    assert calls == ['fetch', 'plot']
+    assert load_journal(journal)[DAY]['fetch']['attempts'] == 1
+
+
+def test_failed_stage_is_rerun(journal):
+    calls = []
+    assert not run_stages(pipeline(calls, plot_fails=True), DAY, journal)
+    entry = load_journal(journal)[DAY]['plot']
+    assert entry['status'] == 'failed'
+    assert entry['error'] == 'RuntimeError: plot broke'
+
+    assert run_stages(pipeline(calls), DAY, journal)
+    assert calls == ['fetch', 'plot', 'plot']
+    assert load_journal(journal)[DAY]['plot']['attempts'] == 2
+
+
+def test_dependent_reruns_after_its_dependency_reruns(journal):
+    calls = []
+    run_stages(pipeline(calls), DAY, journal)
+    mark_failed(journal, 'fetch')
+    calls.clear()
+
+    assert run_stages(pipeline(calls), DAY, journal)
+    assert calls == ['fetch', 'plot']
+
+
+def test_dependent_is_not_rerun_when_dependency_fails_again(journal):
+    calls = []
+    run_stages(pipeline(calls), DAY, journal)
+    mark_failed(journal, 'fetch')
+    calls.clear()
+
+    assert not run_stages(pipeline(calls, fetch_fails=True), DAY, journal)
+    assert calls == ['fetch']
+    assert load_journal(journal)[DAY]['plot']['status'] == 'done'
+
+
+def test_days_are_journaled_separately(journal):
+    calls = []
+    run_stages(pipeline(calls), DAY, journal)
+    run_stages(pipeline(calls), '2025-03-05', journal)
+    assert calls == ['fetch', 'plot', 'fetch', 'plot']
@@ -0,0 +1,85 @@
+import pandas as pd
+import pytest
+
+import windowed_reader
+from windowed_reader import load_offset_index, read_csv_window, upsert_csv
+
+ROWS = [
+    {'category': 'DII **', 'date': '03-Mar-25', 'buyValue': 10.5, 'sellValue': 8.25, 'netValue': 2.25},
+    {'category': 'FII/FPI *', 'date': '03-Mar-25', 'buyValue': 7.0, 'sellValue': 9.0, 'netValue': -2.0},
+    {'category': 'DII **', 'date': '04-Mar-25', 'buyValue': 11.0, 'sellValue': 9.0, 'netValue': 2.0},
+    {'category': 'FII/FPI *', 'date': '04-Mar-25', 'buyValue': 6.0, 'sellValue': 9.5, 'netValue': -3.5},
+]
+
+
+@pytest.fixture
+def history(tmp_path):
+    filename = str(tmp_path / 'fii.csv')
+    pd.DataFrame(ROWS).to_csv(filename, index=False)
+    return filename
+
+
+def test_upsert_keep_last_replaces_existing_row(history):
+    new = pd.DataFrame([{'category': 'DII **', 'date': '03-Mar-25', 'buyValue': 1.0,
+                         'sellValue': 1.0, 'netValue': 0.0}])
+    upsert_csv(history, new, ['date', 'category'], keep='last')
+    df = pd.read_csv(history)
+    assert len(df) == 4
+    assert df.iloc[-1]['buyValue'] == 1.0
+    assert (df[['date', 'category']].value_counts() == 1).all()
+
+
+def test_upsert_keep_first_skips_existing_row(history):
+    before = open(history).read()
+    new = pd.DataFrame([{'category': 'DII **', 'date': '03-Mar-25', 'buyValue': 1.0,
+                         'sellValue': 1.0, 'netValue': 0.0}])
+    assert upsert_csv(history, new, ['date', 'category'], keep='first').empty
+    assert open(history).read() == before
+
+
+def test_upsert_new_rows_are_appended(history):
+    before = open(history).read()
+    new = pd.DataFrame([{'category': 'DII **', 'date': '05-Mar-25', 'buyValue': 1.0,
+                         'sellValue': 1.0, 'netValue': 0.0}])
+    upsert_csv(history, new, ['date', 'category'], keep='last')
+    assert open(history).read().startswith(before)
+    assert len(pd.read_csv(history)) == 5
+
+
+def test_upsert_adds_new_columns(history):
+    new = pd.DataFrame([{'category': 'DII **', 'date': '05-Mar-25', 'buyValue': 1.0,
+                         'sellValue': 1.0, 'netValue': 0.0, 'source': 'api'}])
+    upsert_csv(history, new, ['date', 'category'], keep='last')
+    df = pd.read_csv(history)
+    assert list(df.columns)[-1] == 'source'
+    assert df['source'].isna().sum() == 4
+    assert df.iloc[-1]['source'] == 'api'
+
+
+def test_read_window_filters_and_compacts(history):
+    df = read_csv_window(history, 'date', start='2025-03-04')
+    assert list(df['date'].dt.day) == [4, 4]
+    assert df['buyValue'].dtype == 'float32'
+    assert df['category'].dtype == 'category'
+
+
+def test_offset_index_is_extended_after_append(history, monkeypatch):
+    monkeypatch.setattr(windowed_reader, 'INDEX_BLOCK', 2)
+    monkeypatch.setattr(windowed_reader, 'INDEX_MIN_BYTES', 0)
+    first = load_offset_index(history, 'date')
+
+    new = pd.DataFrame([{'category': 'DII **', 'date': '05-Mar-25', 'buyValue': 1.0,
+                         'sellValue': 1.0, 'netValue': 0.0}])
+    upsert_csv(history, new, ['date', 'category'], keep='last')
+
+    rebuilt = []
+    original = windowed_reader.build_offset_index
+    monkeypatch.setattr(windowed_reader, 'build_offset_index',
+                        lambda *a, **kw: rebuilt.append(kw.get('resume')) or original(*a, **kw))
+    extended = load_offset_index(history, 'date')
+    assert rebuilt and rebuilt[0] is not None
+    assert extended['checkpoints'][:len(first['checkpoints'])] == first['checkpoints']
+
+    expected = original(history, 'date')
+    assert extended['checkpoints'] == expected['checkpoints']
+    assert list(read_csv_window(history, 'date', start='2025-03-05')['date'].dt.day) == [5]